@@ -23,6 +23,12 @@ See examples immediately below, then add your own; be sure to import and use the
 roi_configs for them to be applied by eeImageryInterface.
 """
 
+import ee
+import sys
+from types import MappingProxyType
+from collections.abc import Mapping
+
+
 example_S1_filters = {
     # Group by instrument mode and polarisation;
     # E.g. Get EW imagery with HH/HV polarisation, and IW imagery with VV polarisation.
@@ -69,3 +75,175 @@ example_S2_filters = {
         }
     ]
 }
+
+
+# ------- Filter flattening & compilation ------- #
+
+def flatten_filter_tree(tree, max_depth=10):
+    """
+    Flatten a nested filter config into a flat index of groups, in a single pass.
+    Raises ValueError if no 'filters' are found within max_depth levels of nesting
+    (e.g. a config that accidentally refers back to itself).
+
+    E.g. example_S1_filters becomes:
+        {
+            ('EW', 'HH-HV'): ({'type': 'listContains', ...}, ...),
+            ('IW', 'VV'): ({'type': 'listContains', ...}, ...)
+        }
+    An ungrouped config (like example_S2_filters) maps the empty path () to its filters,
+    as does an empty config (no filters at all).
+
+    Return: dict{tuple(group keys): tuple(filter dicts)}
+    """
+    flat = {}
+    stack = [((), tree)]
+    while stack:
+        path, node = stack.pop()
+        if not isinstance(node, Mapping):
+            raise ValueError(f"Expected dict for filter group {'/'.join(path)}, "
+                             f"got {type(node)}")
+        if 'filters' in node or not node:
+            flat[path] = tuple(node.get('filters', ()))
+            continue
+        if len(path) >= max_depth:
+            raise ValueError(f"No 'filters' found for group {'/'.join(map(str, path))} "
+                             f"within max_depth ({max_depth}) levels of nesting")
+        # Push children in reverse so groups are indexed in config order
+        for sub_key, sub_tree in reversed(list(node.items())):
+            stack.append((path + (sub_key,), sub_tree))
+
+    return flat
+
+
+def _typed_key(value):
+    """
+    Hashable key for a filter arg, tagged with its type (recursively, for lists/tuples)
+    so that args that compare equal across types (1 == 1.0 == True) don't collide.
+    """
+    if isinstance(value, (list, tuple)):
+        return (tuple, tuple(_typed_key(v) for v in value))
+    return (type(value), value)
+
+
+# Memo of constructed ee.Filters; (type, _typed_key(args)) -> ee.Filter
+_BUILT_FILTERS = {}
+
+
+def compile_filter_list(filters):
+    """
+    Construct the ee.Filter described by each {'type', 'args'} dict in filters.
+
+    Filters are memoized by (type, args), so identical filters (e.g. the same
+    eq('instrumentMode', 'IW') used in several seasons) share a single ee.Filter object.
+    Note that ee.Filter attributes only exist once ee.Initialize() has been called.
+
+    Return: tuple of ee.Filter
+    """
+    compiled = []
+    for f in filters:
+        try:
+            key = (f['type'], _typed_key(f['args']))
+            hash(key)
+        except TypeError:  # unhashable args (e.g. a dict); don't memoize
+            compiled.append(getattr(ee.Filter, f['type'])(*f['args']))
+            continue
+        if key not in _BUILT_FILTERS:
+            _BUILT_FILTERS[key] = getattr(ee.Filter, f['type'])(*f['args'])
+        compiled.append(_BUILT_FILTERS[key])
+    return tuple(compiled)
+
+
+def compile_group_filter(filters):
+    """
+    Combine a group's filters into a single ee.Filter, so that a collection can be
+    filtered with one server-side predicate rather than a chain of .filter() calls.
+
+    Return: ee.Filter, or None if filters is empty
+    """
+    compiled = compile_filter_list(filters)
+    if not compiled: return None
+    if len(compiled) == 1: return compiled[0]
+    return ee.Filter.And(*compiled)
+
+
+
+# ------- Config freezing ------- #
+
+# Hash-consing pools; identical filters (and lists of filters) anywhere in the configs
+# resolve to a single shared, read-only instance.
+# Keys tag args with their types (see _typed_key), so e.g. eq('x', 1) and eq('x', True)
+# stay distinct.
+_FILTER_POOL = {}  # (type, typed args) -> MappingProxyType({'type', 'args'})
+_LIST_POOL = {}  # ((type, typed args), ...) -> tuple of pooled filters
+
+
+def _freeze_args(args):
+    return tuple(_freeze_args(a) if isinstance(a, (list, tuple)) else a for a in args)
+
+
+def _pool_filter_list(filters):
+    """
+    Canonicalize a 'filters' list to a pooled tuple of pooled {'type', 'args'} filters.
+    Filters that can't be keyed (e.g. unhashable args) are left as they are.
+    """
+    try:
+        keys = tuple((f['type'], _typed_key(f['args'])) for f in filters)
+        hash(keys)
+    except (KeyError, TypeError):
+        return tuple(filters)
+
+    if keys not in _LIST_POOL:
+        _LIST_POOL[keys] = tuple(
+            _FILTER_POOL.setdefault(k, MappingProxyType(
+                {'type': f['type'], 'args': _freeze_args(f['args'])}))
+            for k, f in zip(keys, filters))
+    return _LIST_POOL[keys]
+
+
+def _is_filter_spec(d):
+    return 'type' in d and 'args' in d
+
+
+def freeze_config(cfg, _memo=None):
+    """
+    Intern every dict key and string leaf in a (nested) config, and make each filter
+    ({'type', 'args'} dict) read-only. 'filters' lists are hash-consed into shared tuples
+    of MappingProxyType filters (see _FILTER_POOL and _LIST_POOL), so identical filters
+    across groups, seasons and RoIs are the same object.
+
+    All other dicts (RoI entries, seasons, filter groups) and lists stay plain and are
+    updated in place, so that config shared between seasons or RoIs stays shared;
+    already-frozen mappings are walked but not rebuilt.
+
+    Return: frozen cfg
+    """
+    if _memo is None: _memo = {}
+    if id(cfg) in _memo: return _memo[id(cfg)]
+
+    frozen = cfg
+    if isinstance(cfg, str):
+        return sys.intern(cfg)
+    elif isinstance(cfg, dict):
+        items = [(sys.intern(k) if isinstance(k, str) else k, freeze_config(v, _memo))
+                 for k, v in cfg.items()]
+        cfg.clear()
+        cfg.update(items)
+        if isinstance(cfg.get('filters'), list):
+            cfg['filters'] = _pool_filter_list(cfg['filters'])
+        if _is_filter_spec(cfg): frozen = MappingProxyType(cfg)
+    elif isinstance(cfg, Mapping):
+        for v in cfg.values():
+            freeze_config(v, _memo)
+    elif isinstance(cfg, list):
+        cfg[:] = [freeze_config(v, _memo) for v in cfg]
+
+    _memo[id(cfg)] = frozen
+    return frozen
+
+
+freeze_config(example_S1_filters)
+freeze_config(example_S2_filters)
+
+# Flat (group path -> filters) views of the examples above
+example_S1_filters_flat = flatten_filter_tree(example_S1_filters)
+example_S2_filters_flat = flatten_filter_tree(example_S2_filters)
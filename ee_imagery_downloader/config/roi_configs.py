@@ -1,3 +1,6 @@
+import datetime as dt
+from types import MappingProxyType
+
 import ee_imagery_downloader.config.collection_filters as coll_filters
 
 """
@@ -10,19 +13,23 @@ This file configures regions of interest (RoI). RoIs are registered by an entry
     
     3. A set of Earth Engine image collections to support (give them nicknames!)
     
-    4. One or multiple keyed sets of imagery filters, representing seasons. This system
-        is implemented to:
+    4. One or multiple keyed sets of imagery filters, representing seasons. Each season
+        has a 'date_start', a 'date_end' and 'collection_filters' (per-collection filter
+        configs, as defined in collection_filters.py). Dates are given as 'YYYY-MM-DD'
+        strings, and parsed to datetimes once when this module is loaded. This system is
+        implemented to:
         a. Be able to filter imagery to multiple non-continuous date ranges (e.g. same
             range of months for different seasons)
         b. Force natural chunking of export data (only supports one season at a time) to
             avoid accidentally overrunning Google Drive storage space.
 """
 
-# Shorthand to use S1 & S2 as configured in collection_filters.py
-S1_S2_filters = {
+# Shorthand to use S1 & S2 as configured in collection_filters.py. Read-only, since the
+# same mapping is referenced (not copied) by every season that uses it.
+S1_S2_filters = MappingProxyType({
     'S1': coll_filters.example_S1_filters,
     'S2': coll_filters.example_S2_filters
-}
+})
 
 roi_configs = {
     # Add your RoI as a new dict item: 'roi_name': { ... }
@@ -47,13 +54,29 @@ roi_configs = {
             "2022": {
                 "date_start": "2021-12-01",
                 "date_end": "2022-05-31",
-                **S1_S2_filters
+                "collection_filters": S1_S2_filters
             },
             "2020": {
                 "date_start": "2020-01-01",
                 "date_end": "2020-06-30",
-                **S1_S2_filters
+                "collection_filters": S1_S2_filters
             }
         }
     }
-}
\ No newline at end of file
+}
+
+
+def _parse_season_dates(configs, date_fmt='%Y-%m-%d'):
+    """
+    Parse season date_start/date_end strings to datetimes once, in place, so they're
+    not re-parsed (client- or server-side) every time imagery is filtered by date.
+    """
+    for roi_cfg in configs.values():
+        for szn_cfg in roi_cfg.get('imagery_filters', {}).values():
+            for k in ['date_start', 'date_end']:
+                if isinstance(szn_cfg.get(k), str):
+                    szn_cfg[k] = dt.datetime.strptime(szn_cfg[k], date_fmt)
+
+
+_parse_season_dates(roi_configs)
+roi_configs = MappingProxyType(coll_filters.freeze_config(roi_configs))
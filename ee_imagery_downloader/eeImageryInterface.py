@@ -1,14 +1,56 @@
 import ee
-import copy
 import time
+import numpy as np
+import functools
 import pprint
 import warnings
 import datetime as dt
 
 import ee_imagery_downloader.utils as utils
+import ee_imagery_downloader.config.collection_filters as coll_filters
 from ee_imagery_downloader.config.roi_configs import roi_configs
 
 
+HIGH_VOLUME_URL = 'https://earthengine-highvolume.googleapis.com'
+
+# ee is initialized once per process (see _ensure_ee)
+_EE_READY = False
+_EE_URL = None
+
+# RoI polygons, built once per RoI name (see eeImageryInterface.__init__)
+_ROI_GEOMS = {}
+
+
+def _ensure_ee(opt_url=None):
+    """
+    Initialize the ee client unless it has already been initialized against the same
+    endpoint (opt_url; None for the default), e.g. by a previous eeImageryInterface.
+    """
+    global _EE_READY, _EE_URL
+    if _EE_READY and _EE_URL == opt_url: return
+    if opt_url is None:
+        ee.Initialize()
+    else:
+        ee.Initialize(opt_url=opt_url)
+    _EE_READY = True
+    _EE_URL = opt_url
+
+
+def _to_datetime(date, date_fmt='%Y-%m-%d'):
+    if isinstance(date, dt.datetime): return date
+    return dt.datetime.strptime(date, date_fmt)
+
+
+@functools.lru_cache(maxsize=None)
+def _validate_filter_types(coll_key, filter_types):
+    """
+    Assert that each filter type is an ee.Filter attribute. Memoized, so configs with
+    the same filters (e.g. shared by several seasons or RoIs) are only checked once.
+    """
+    for t in filter_types:
+        assert hasattr(ee.Filter, t), f"Invalid filter type provided for {coll_key}: {t}"
+
+
 class eeImageryInterface:
     """
     Retrieve, filter & process imagery from the Google Earth Engine catalog.
@@ -35,11 +77,13 @@ class eeImageryInterface:
         - roi_name (str): Name of region of interest (roi_configs entry)
         - config (dict): Configuration dictionary for the given RoI
         - ee_roi (ee.Geometry.Polygon): Polygon describing the location of the RoI
+            (built once per RoI and shared by instances)
         - ee_collections (dict): LUT mapping collection nicknames to GEE identifiers 
         - imagery_filters (dict): nested dictionaries describing per-collection filter
             (e.g. date ranges, polarisations, cloud cover %), keyed by season (year)
         - imagery (dict): ee proxy objects for imagery retrieved by applying imagery_
             filters to ee_collections. Follows same nested structure as imagery_filters.
+            Images intersect ee_roi but are only clipped to it when mosaicked/exported.
             E.g.:
             {
                 '2022': {
@@ -51,12 +95,17 @@ class eeImageryInterface:
                 }
             }
     """
-    def __init__(self, roi):
+    def __init__(self, roi, high_volume=False):
         """
         Inits eeImageryInterface for a given RoI.
 
         Args:
             - roi (str): key in config.image_filtering_configs.roi_configs
+            - high_volume (bool: default False): initialize ee against the high-volume
+                endpoint (HIGH_VOLUME_URL), which allows
+                many more concurrent requests - useful when exporting many images.
+                Trade-off: it is meant for automated workloads; results aren't cached
+                and it isn't the endpoint the interactive Code Editor uses.
         """
         # --- Input checking --- #
         roi = roi.lower()
@@ -70,10 +119,15 @@ class eeImageryInterface:
                 "roi_coords (list of [lat, ln]) should be specified in roi_configs")
 
         # --- Initialize ee client --- #
-        ee.Initialize()
+        _ensure_ee(HIGH_VOLUME_URL if high_volume else None)
 
         # --- Configuration & Defaults --- #
-        self.ee_roi = ee.Geometry.Polygon([self.config['roi_coords']])
+        # Build the RoI polygon once per RoI (roi_configs is left untouched). A non-zero
+        # error margin (1m) avoids memory-intensive densification in geometry operations.
+        if roi not in _ROI_GEOMS:
+            _ROI_GEOMS[roi] = ee.Geometry.Polygon(
+                [self.config['roi_coords']], None, False, 1.0)
+        self.ee_roi = _ROI_GEOMS[roi]
 
         # Default collections: COPERNICUS/S1_GRD & COPERNICUS/S2
         try:
@@ -89,18 +143,20 @@ class eeImageryInterface:
             self.imagery_filters = self.config['imagery_filters']
         except KeyError:
             now = dt.datetime.now()
-            default_end = ee.Date(dt.datetime.now())
-            default_start = default_end.advance(-2, 'week')
+            default_end = now
+            default_start = now - dt.timedelta(weeks=2)
             self.imagery_filters = {}
             self.imagery_filters[str(now.year)] = {
                 "date_start": default_start,
                 "date_end": default_end,
                 # Add collection keys without any filters
-                **{coll_key: {} for coll_key in self.ee_collections.keys()}
+                "collection_filters": {
+                    coll_key: {} for coll_key in self.ee_collections.keys()
+                }
             }
         
         # For easier downstream implementation, store flattened version of nested imagery
-        # filter configs; [ {'nested_keys': [], 'filters': []}, ...] for each szn, coll.
+        # filter configs; {(nested keys): ee.Filter} for each szn, coll.
         # Note that date ranges are still stored in imagery_filters.
         self._flattened_filters = {
             szn: {
@@ -109,33 +165,63 @@ class eeImageryInterface:
         }
 
         # While flattening, do some verification
-        for szn, coll_cfg in self.imagery_filters.items():  # By year
+        szn_keys = ['date_start', 'date_end', 'collection_filters']
+        for szn, szn_cfg in self.imagery_filters.items():  # By year
+            for k in szn_cfg.keys():
+                if k not in szn_keys:
+                    raise ValueError(f"imagery_filters key {k} for {szn} not recognized.")
+
+            # Date ranges aren't flattened; only per-collection filters are
+            coll_cfg = szn_cfg.get('collection_filters', {})
             for coll_key, filt_cfg in coll_cfg.items():  # By collection
 
-                # Verify that imagery_filter keys are consistent with ee_collections keys
-                daterange_keys = ['date_start', 'date_end']
-                accepted_keys = list(self.ee_collections.keys()) + daterange_keys
-                if coll_key not in accepted_keys:
+                # Verify that collection_filters keys are consistent with ee_collections
+                if coll_key not in self.ee_collections:
                     raise ValueError(
-                        f"imagery_filters key {coll_key} for {szn} not recognized.")
-
-                # Don't try to flatten date range filters
-                if coll_key in daterange_keys: continue
+                        f"collection_filters key {coll_key} for {szn} not recognized.")
 
-                # Do try to flatten collection - recursive function with depth limit
-                flattened_filters = utils.flatten_nested_imagery_filters(filt_cfg)
+                # Try to flatten collection into {group path: filters}
+                flattened_filters = coll_filters.flatten_filter_tree(filt_cfg)
                 
                 # Verify that all listed filter types are legimite ee.Filters 
-                for nested_filter in flattened_filters:
-                    filters = nested_filter['filters']
-                    for f in filters:
-                        assert hasattr(ee.Filter, f['type']), \
-                            f"Invalid filter type provided for {coll_key}: {f['type']}"
+                _validate_filter_types(coll_key, tuple(
+                    f['type'] for filters in flattened_filters.values() for f in filters))
+
+                for group_path, filters in flattened_filters.items():
+                    # Build one combined ee.Filter per group (memoized across seasons)
+                    flattened_filters[group_path] = \
+                        coll_filters.compile_group_filter(filters)
                 
                 self._flattened_filters[szn][coll_key] = flattened_filters
 
+        # Index season date ranges (already datetimes; roi_configs parses its own) in
+        # arrays; date queries are matched against all seasons at once
+        self._szn_keys = list(self.imagery_filters.keys())
+        szn_cfgs = self.imagery_filters.values()
+        self._szn_starts = np.array(
+            [szn_cfg['date_start'] for szn_cfg in szn_cfgs], dtype='datetime64[s]')
+        self._szn_ends = np.array(
+            [szn_cfg['date_end'] for szn_cfg in szn_cfgs], dtype='datetime64[s]')
+        # Build ee.Date proxies for each season's date range once
+        self._ee_dates = {
+            szn: (ee.Date(szn_cfg['date_start']), ee.Date(szn_cfg['date_end']))
+            for szn, szn_cfg in self.imagery_filters.items()
+        }
+        # Baseline (date range + roi bounds) filter for each season, shared by all of
+        # the season's collections
+        self._base_filters = {
+            szn: ee.Filter.And(
+                ee.Filter.date(date_start, date_end),
+                ee.Filter.bounds(self.ee_roi)
+            ) for szn, (date_start, date_end) in self._ee_dates.items()
+        }
+        # Memoize date query matching per instance (getImagery & exportImagery both
+        # parse the same date_query)
+        self._match_date_query = functools.lru_cache(maxsize=128)(self._match_date_query)
+
         # --- Initialize state --- #
         self.imagery = {}
+        self._str_cache = None
         self._loadImagery()
 
 
@@ -144,6 +230,10 @@ class eeImageryInterface:
 
 
     def __str__(self):
+        # Formatting the imagery tree calls repr on many ee proxies; build it once per
+        # load of imagery (see _reset_imagery)
+        if self._str_cache is not None: return self._str_cache
+
         print_string = ''
         print_string += f"eeImageryInterface for {self.roi_name};\n"
         
@@ -151,19 +241,20 @@ class eeImageryInterface:
         print_string += f"> Imagery loaded for seasons: {', '.join(szns)}\n"
         print_string += "> Structure of self.imagery (keyed by season):\n"
         ex_szn = szns[-1]
-        pp = pprint.PrettyPrinter(indent=1, depth=6)
+        pp = pprint.PrettyPrinter(indent=1, depth=3)
         print_string += pp.pformat(self.imagery[str(ex_szn)])
 
+        self._str_cache = print_string
         return print_string
     
 
     def getImagery(
             self,
             collection,
-            nested_keys=[],
-            bands=[],
+            nested_keys=None,
+            bands=None,
             season=None,
-            date_query={},  # {'start', 'end', ['format']}
+            date_query=None,  # {'start', 'end', ['format']}
             mosaic_window=None  # None, 'hour', 'day', 'week', or 'month'
         ):
         """
@@ -171,18 +262,24 @@ class eeImageryInterface:
 
         Args:
             - collection (str) - key in self.ee_collections
-            - nested_keys (list: default [])
-            - bands (list: default [])
+            - nested_keys (list: default None)
+            - bands (list: default None)
             - season (str: default None) - retrieve all imagery for the given season
-            - date_query (obj: default {}) - finer-grained control on selected imagery;
+            - date_query (obj: default None) - finer-grained control on selected imagery;
                 should contain keys 'start' and 'end', and optionally 'format' string
                 ('%Y-%m-%d' will be attempted by default).
             - mosaic_window (str: default None) - If specified, imagery will be mosaicked
                 by the time window specified. If None, images are not mosaicked.
                 Mosaicking can add significantly higher computation time, and result in 
                 larger exported files that may get chunked on Google Drive.
+
+        Note that if no processing is requested (date_query, bands or mosaic_window), the
+        returned imagery is shared with self.imagery and should not be modified.
         """
-        season, date_query = self._handle_season_and_date_query_args(season, date_query)
+        nested_keys = nested_keys or []
+        bands = bands or []
+        season, date_query = self._handle_season_and_date_query_args(
+            season, date_query or {})
 
         if date_query:
             parsed_date_query = self._parse_date_query(date_query)
@@ -191,7 +288,7 @@ class eeImageryInterface:
             query_end = parsed_date_query['end']
 
         try:
-            imgry = copy.deepcopy(self.imagery[season][collection])
+            imgry = self.imagery[season][collection]
         except KeyError:
             warnings.warn(f"imagery not loaded for {season}, {collection}")
             return None
@@ -204,23 +301,23 @@ class eeImageryInterface:
                 warnings.warn(f"Nested key {k} not found in {season}, {collection}")
 
         # If no additional processing required, return collection (possibly grouped)
+        # (read-only; no copy is made, so this is shared with self.imagery)
         if not date_query and  mosaic_window is None and not bands: return imgry
 
         # It's possible that imgry still points to a tree of nested groups; any
         # processing requested (e.g. filtering or mosaicking) in this case must be
         # applied to each collection individually. We thus need to traverse the tree,
-        # access each of the collections (leaves), apply the processing, then return the
-        # whole tree now containing the processed collections.
+        # access each of the collections (leaves), apply the processing, and build a
+        # new tree containing the processed collections (self.imagery is untouched).
 
-        date_start = ee.Date(query_start) if date_query \
-            else ee.Date(self.imagery_filters[season]['date_start'])
-        date_end = ee.Date(query_end) if date_query \
-            else ee.Date(self.imagery_filters[season]['date_end'])
+        date_start = ee.Date(query_start) if date_query else self._ee_dates[season][0]
+        date_end = ee.Date(query_end) if date_query else self._ee_dates[season][1]
 
         # Use a recursive function to traverse the grouped tree & apply processing
         # (filtering, band selection, mosaicking, etc.) within the local context 
-        def apply_processing(ptr, sub_keys=[]):
-            # Base case - made it to a leaf; apply processing
+        def apply_processing(ptr, sub_keys=()):
+            # Base case - made it to a leaf; apply processing. Filtering & band
+            # selection come first so that mosaicking handles as little data as possible
             if isinstance(ptr, ee.ImageCollection):
                 if date_query:
                     ptr = ptr.filter(
@@ -241,11 +338,11 @@ class eeImageryInterface:
                     )
                 return ptr
 
-            # Recursion case: traverse children
-            for child_key in ptr.keys():
-                ptr[child_key] = apply_processing(ptr[child_key], sub_keys + [child_key])
-            
-            return ptr
+            # Recursion case: traverse children into a new dict
+            return {
+                child_key: apply_processing(child, sub_keys + (child_key,))
+                for child_key, child in ptr.items()
+            }
 
         return apply_processing(imgry)
 
@@ -253,12 +350,12 @@ class eeImageryInterface:
     def exportImagery(
             self,
             collection,
-            nested_keys=[],
-            bands=[],
+            nested_keys=None,
+            bands=None,
             season=None,
-            date_query={},
+            date_query=None,
             mosaic_window=None,
-            export_params={}
+            export_params=None
         ):
         """
         Export a single ImageCollection to Google Drive. Note that this is fine-grained;
@@ -268,14 +365,14 @@ class eeImageryInterface:
         
         Args:
             - collection (str) - key in self.ee_collections
-            - nested_keys (list: default [])
-            - bands (list: default [])
+            - nested_keys (list: default None)
+            - bands (list: default None)
             - season (str: default None) - retrieve all imagery for the given season
-            - date_query (obj: default {}) - finer-grained control on selected imagery;
+            - date_query (obj: default None) - finer-grained control on selected imagery;
                 should contain keys 'start' and 'end', and optionally 'format' string
                 ('%Y-%m-%d' will be attempted by default).
             - mosaic_window (str: default None)
-            - export_params (dict: default {})
+            - export_params (dict: default None) - copied; the caller's dict isn't modified
                 -> (REQ) 'scale' OR 'crsTransform' OR 'dimensions':
                     o 'scale' (int): pixel spacing in meters of exported imagery
                     o 'crsTransform' (list): affine transformation consistent with 'crs'
@@ -289,6 +386,10 @@ class eeImageryInterface:
                     Default: "{roi name}/{collection name}-{season}/{Nested-Keys}"
                     Note that this is all one folder name; '/' doesn't create subfolders :(
         """
+        nested_keys = nested_keys or []
+        date_query = date_query or {}
+        export_params = dict(export_params) if export_params else {}
+
         # Required export_params
         geom_args = ['scale', 'crsTransform', 'dimensions']
         geom_args_provided = [k in export_params for k in geom_args]
@@ -335,13 +436,20 @@ class eeImageryInterface:
             f"{collection}/{'/'.join(nested_keys)} is not an ImageCollection; you may " \
             f"need to specify more nested_keys; \n{self.__str__()}"
 
-        # Get user's confirmation on exporting these images & bands
-        n_images = export_collection.size().getInfo()
+        # Get user's confirmation on exporting these images & bands. Both counts are
+        # fetched in one round-trip; bands are only counted if there is a first image.
+        coll_size = export_collection.size()
+        summary = ee.Dictionary({
+            'n_images': coll_size,
+            'n_bands': ee.Algorithms.If(
+                coll_size, export_collection.first().bandNames().size(), 0)
+        }).getInfo()
+        n_images = summary['n_images']
         if not n_images:
             print(f"No images found for configuration")
             return
 
-        n_bands = export_collection.first().bandNames().size().getInfo()
+        n_bands = summary['n_bands']
         
         print(f"About to export {n_images} {collection}"
               f"{'/'+'/'.join(nested_keys) if nested_keys else ''} images, "
@@ -366,28 +474,45 @@ class eeImageryInterface:
         print(f"\nWaiting for {len(export_tasks)} export tasks to finish...")
         exp_start = time.time()
         last_update = exp_start-300
-        task_outstanding = True
-        failed_taskids = []
-        while task_outstanding:
-            time.sleep(3)
-            task_outstanding = False
-            n_completed = 0
-            n_failed = 0
-            for i, t in enumerate(export_tasks):
-                t_state = t.status()['state']
-                if t_state not in ['COMPLETED', 'FAILED', 'CANCELLED']:
-                    task_outstanding = True
-                elif t_state in['FAILED', 'CANCELLED'] and i not in failed_taskids:
-                    print(f"Task {i} failed.")
-                    n_failed+=1
-                    failed_taskids.append(i)
-                else:
-                    n_completed+=1
+        task_idx_by_id = {t.id: i for i, t in enumerate(export_tasks)}
+        completed_ids = set()
+        failed_ids = set()
+        poll_delay = 3.0
+        while len(completed_ids) + len(failed_ids) < len(export_tasks):
+            time.sleep(poll_delay)
+            n_finished = len(completed_ids) + len(failed_ids)
+
+            # Fetch the state of all tasks from one task listing, rather than one request
+            # per task (the listing is paged, so it's more than one request for projects
+            # with a long task history). Tasks missing from the listing are asked for
+            # their status directly, so the loop can't wait on them forever.
+            listed = {
+                task_status['id']: task_status for task_status in ee.data.getTaskList()
+                if task_status['id'] in task_idx_by_id
+            }
+            for t in export_tasks:
+                t_id = t.id
+                if t_id in completed_ids or t_id in failed_ids: continue
+
+                task_status = listed[t_id] if t_id in listed else t.status()
+                t_state = task_status['state']
+                if t_state == 'COMPLETED':
+                    completed_ids.add(t_id)
+                elif t_state in ['FAILED', 'CANCELLED']:
+                    print(f"Task {task_idx_by_id[t_id]} failed.")
+                    failed_ids.add(t_id)
+
+            # Most exports take minutes; back off polling while nothing finishes, and
+            # poll quickly again once tasks start finishing
+            if len(completed_ids) + len(failed_ids) > n_finished:
+                poll_delay = 3.0
+            else:
+                poll_delay = min(poll_delay * 1.5, 60.0)
             
             if (time.time() - last_update) > 300:  # Give update every 5 min
                 print(f"> {(time.time()-exp_start)/60:.1f} min elapsed; "
-                      f"{n_completed}/{len(export_tasks)} tasks completed, "
-                      f"{n_failed} failed.")
+                      f"{len(completed_ids)}/{len(export_tasks)} tasks completed, "
+                      f"{len(failed_ids)} failed.")
                 last_update = time.time()
         
         exp_end = time.time()
@@ -395,11 +520,9 @@ class eeImageryInterface:
 
 
     def _reset_imagery(self):
-        self.imagery = {
-            szn: {
-                coll_key: {} for coll_key in self.ee_collections.keys()
-            } for szn in self.imagery_filters.keys()
-        }
+        # Nested levels are created as needed when imagery is loaded
+        self._str_cache = None
+        self.imagery.clear()
 
 
     def _loadImagery(self):
@@ -409,45 +532,44 @@ class eeImageryInterface:
         """
         self._reset_imagery()
 
-        # Fetch & store imagery by season (year)
-        # Note that start & end dates for a season might not all belong to the same year
-        # (e.g. date filter for '2022' may start in December 2021), which is ok since
-        # date ranges are only pulled from the user-specified imagery_filters config.
+        # Building collections only creates local ee proxies (no network requests)
         for szn in self.imagery_filters.keys():
-            date_start = ee.Date(self.imagery_filters[szn]['date_start'])
-            date_end = ee.Date(self.imagery_filters[szn]['date_end'])
-
-            # Loop over all collections in filter config
             for coll_key in self._flattened_filters[szn].keys():
-                ee_coll_name = self.ee_collections[coll_key]
-
-                # Get 'baseline' collection (date + roi filters only)
-                base_coll = (ee.ImageCollection(ee_coll_name)
-                    .filter(ee.Filter.date(date_start, date_end))
-                    .filter(ee.Filter.bounds(self.ee_roi))
-                ).map(lambda img: img.clip(self.ee_roi))
-
-                # Construct each nested (or not) path for differently-filtered imagery
-                nested_filters = self._flattened_filters[szn][coll_key]
-                for nested_filter in nested_filters:
-                    nested_keys = nested_filter['nested_keys']
-                    filters = nested_filter['filters']
-
-                    # Construct the nested path
+                for imgry_keys, filtered_coll in self._build_one(szn, coll_key):
+                    # Construct the nested path & populate the nested level
                     imgry_ptr = self.imagery
-                    imgry_keys = [szn, coll_key] + nested_keys
                     for k in imgry_keys[:-1]:
                         imgry_ptr = imgry_ptr.setdefault(k, {})
-                    
-                    # Filter the collection & populate the nested level
-                    filtered_coll = base_coll
-                    for filter_components in filters:
-                        filter_class = getattr(ee.Filter, filter_components['type'])
-                        filt = filter_class(*filter_components['args'])
-                        filtered_coll = filtered_coll.filter(filt)
-
                     imgry_ptr[imgry_keys[-1]] = filtered_coll
 
+
+    def _build_one(self, szn, coll_key):
+        """
+        Build the filtered ee.ImageCollection for each group configured for a season
+        and collection.
+
+        Return: list of (imagery keys [szn, coll_key, *group_path], ee.ImageCollection)
+        """
+        ee_coll_name = self.ee_collections[coll_key]
+
+        # Get 'baseline' collection (date + roi filters only, as a single predicate).
+        # Images aren't clipped to the roi here; mosaics & exports clip them to it.
+        # Note that start & end dates for a season might not all belong to the same year
+        # (e.g. date filter for '2022' may start in December 2021), which is ok since
+        # date ranges are only pulled from the user-specified imagery_filters config.
+        base_coll = ee.ImageCollection(ee_coll_name).filter(self._base_filters[szn])
+
+        # Filter each nested (or not) group of differently-filtered imagery
+        built = []
+        nested_filters = self._flattened_filters[szn][coll_key]
+        for group_path, group_filter in nested_filters.items():
+            filtered_coll = base_coll
+            if group_filter is not None:
+                filtered_coll = base_coll.filter(group_filter)
+            built.append(([szn, coll_key, *group_path], filtered_coll))
+
+        return built
+
     
     def _handle_season_and_date_query_args(self, season, date_query):
         """
@@ -500,44 +622,36 @@ class eeImageryInterface:
         Case 4: date_query overlaps multiple seasonal date ranges. TODO.
             Current behaviour: matches first season with overlap.
         """
-        start_date = date_query['start']
-        end_date = date_query['end']
         date_fmt = date_query['format'] if 'format' in date_query else '%Y-%m-%d'
+        return dict(self._match_date_query(
+            date_query['start'], date_query['end'], date_fmt))
 
-        if not isinstance(start_date, dt.datetime):
-            start_date = dt.datetime.strptime(start_date, date_fmt)
-        if not isinstance(end_date, dt.datetime):
-            end_date = dt.datetime.strptime(end_date, date_fmt)
+
+    def _match_date_query(self, start_date, end_date, date_fmt):
+        """
+        Implements _parse_date_query with hashable arguments, so that results can be
+        memoized per instance (see __init__).
+        """
+        start_date = _to_datetime(start_date, date_fmt)
+        end_date = _to_datetime(end_date, date_fmt)
 
         # Check if requested dates overlap date range for a season or not.
         # Return only dates that overlap.
-        matched_szn = None
-        overlap_dates = None
-        for szn, szn_filts in self.imagery_filters.items():
-            szn_start = szn_filts['date_start']
-            szn_end = szn_filts['date_end']
-
-            if not isinstance(szn_start, dt.datetime):
-                szn_start = dt.datetime.strptime(szn_start, '%Y-%m-%d')
-            if not isinstance(szn_end, dt.datetime):
-                szn_end = dt.datetime.strptime(szn_end, '%Y-%m-%d')
-
-            overlap_dates = utils.get_date_range_overlap(
-                start_date, end_date, szn_start, szn_end)
-            
-            if overlap_dates is None: continue
-            
-            matched_szn = szn
-            break
+        query_start = np.datetime64(start_date, 's')
+        query_end = np.datetime64(end_date, 's')
+        overlap_starts, overlap_ends, overlaps = utils.get_date_range_overlaps(
+            self._szn_starts, self._szn_ends, query_start, query_end)
         
-        if matched_szn is None:
-            raise ValueError(f"date_query {date_query} did not match date range for any "
-                             f"seasons configured for {self.roi_name}.")
+        if not overlaps.any():
+            raise ValueError(f"date_query {start_date.strftime(date_fmt)} to "
+                             f"{end_date.strftime(date_fmt)} did not match date range for "
+                             f"any seasons configured for {self.roi_name}.")
 
+        i = int(np.argmax(overlaps))  # First season with overlap
         return {
-            'season': matched_szn,
-            'start': overlap_dates['start'].strftime(date_fmt),
-            'end': overlap_dates['end'].strftime(date_fmt)
+            'season': self._szn_keys[i],
+            'start': overlap_starts[i].astype(dt.datetime).strftime(date_fmt),
+            'end': overlap_ends[i].astype(dt.datetime).strftime(date_fmt)
         }
 
 
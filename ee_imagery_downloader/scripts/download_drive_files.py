@@ -1,15 +1,20 @@
 import os
-import io
+import hashlib
+import functools
 import argparse
+import threading
+import requests
 from tqdm import tqdm
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential_jitter
 
 from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+from google.auth.transport.requests import Request, AuthorizedSession
 from google.auth.exceptions import RefreshError
 from google.oauth2.credentials import Credentials
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
-from googleapiclient.http import MediaIoBaseDownload
 
 """
 This is a command-line script to download all files in a specified
@@ -25,7 +30,27 @@ connect to for Drive access.
 
 # OAuth2 token downloaded from Google Cloud project
 AUTH_DIR = './auth/'
-SCOPES = ['https://www.googleapis.com/auth/drive.readonly']
+SCOPES = ('https://www.googleapis.com/auth/drive.readonly',)
+
+# Files downloaded concurrently; keeps requests under Drive's default ~10 queries/sec/user
+MAX_WORKERS = 8
+
+# Drive API endpoint for file contents; a file's media is fetched with ?alt=media
+FILES_URL = 'https://www.googleapis.com/drive/v3/files'
+
+# Transient failures (rate limiting, server errors, dropped connections) are retried
+# with exponential backoff, up to MAX_ATTEMPTS tries per file
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+MAX_ATTEMPTS = 5
+
+# (connect, read) timeouts in seconds; a stalled download fails (and is retried) rather
+# than hanging its worker
+TIMEOUT = (10, 60)
+
+# requests sessions aren't thread-safe, so each download worker gets its own.
+# Credentials are shared, with refreshes serialized by a lock.
+_thread_local = threading.local()
+_refresh_lock = threading.Lock()
 
 
 def parse_args():
@@ -52,7 +77,12 @@ def parse_args():
     }
 
 
+@functools.lru_cache(maxsize=1)
 def authenticate_gcp_oauth2(auth_dir, scopes):
+    """
+    Get OAuth2 credentials for scopes (a tuple), from a saved token if possible.
+    Memoized, so every caller (e.g. each download thread) shares one Credentials object.
+    """
     creds = None
 
     # Check for existing token
@@ -64,7 +94,8 @@ def authenticate_gcp_oauth2(auth_dir, scopes):
     # If no or expired token, log user in with credentials
     if creds and creds.expired and creds.refresh_token:
         try:
-            creds.refresh(Request())
+            with _refresh_lock:
+                creds.refresh(Request())
             return creds
         except RefreshError:
             # Expired token; remove it and go from scratch
@@ -85,6 +116,90 @@ def authenticate_gcp_oauth2(auth_dir, scopes):
     return creds
 
 
+def ensure_valid(creds):
+    """Refresh expired shared credentials; only one thread refreshes at a time."""
+    if creds.valid: return
+    with _refresh_lock:
+        if not creds.valid: creds.refresh(Request())
+
+
+def drive_session(creds):
+    """Get an authorized requests session for the current thread."""
+    if not hasattr(_thread_local, 'session'):
+        _thread_local.session = AuthorizedSession(creds)
+    return _thread_local.session
+
+
+def _is_transient(error):
+    """Whether a failed download is worth retrying."""
+    if isinstance(error, (requests.ConnectionError, requests.Timeout,
+                          requests.exceptions.ChunkedEncodingError)): return True
+    response = getattr(error, 'response', None)
+    return response is not None and response.status_code in RETRY_STATUSES
+
+
+_backoff = wait_exponential_jitter(initial=1, max=60)
+
+def _wait_for_retry(retry_state):
+    """Wait as long as Drive asks via Retry-After if given, else back off exponentially."""
+    response = getattr(retry_state.outcome.exception(), 'response', None)
+    retry_after = response.headers.get('Retry-After') if response is not None else None
+    if retry_after and retry_after.isdigit(): return float(retry_after)
+    return _backoff(retry_state)
+
+
+@retry(retry=retry_if_exception(_is_transient), wait=_wait_for_retry,
+       stop=stop_after_attempt(MAX_ATTEMPTS), reraise=True)
+def _fetch(file, out_fp, creds):
+    """Stream a single Drive file straight to out_fp in one GET request."""
+    ensure_valid(creds)
+    with drive_session(creds).get(
+            f"{FILES_URL}/{file['id']}", params={'alt': 'media'},
+            stream=True, timeout=TIMEOUT) as r:
+        r.raise_for_status()
+        # iter_content (unlike reading r.raw) undoes transfer compression and re-raises
+        # dropped connections mid-body as requests exceptions
+        with open(out_fp, 'wb') as f:
+            for chunk in r.iter_content(chunk_size=1 << 20):
+                f.write(chunk)
+
+
+def _md5(fp, chunk_size=1 << 20):
+    """MD5 hex digest of a local file, read in chunks."""
+    md5 = hashlib.md5()
+    with open(fp, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            md5.update(chunk)
+    return md5.hexdigest()
+
+
+def _is_downloaded(file, out_fp, local_size):
+    """
+    Whether out_fp (local_size bytes, or None if absent) already holds an intact copy of
+    the Drive file (same size & MD5), e.g. from an earlier, interrupted run. Files
+    without an md5Checksum (Google Docs etc.) are never considered downloaded.
+    """
+    if 'md5Checksum' not in file or local_size is None: return False
+    if local_size != int(file.get('size', -1)): return False
+    return _md5(out_fp) == file['md5Checksum']
+
+
+def _download_one(file, out_fp, creds):
+    """
+    Download a single Drive file (run in a worker thread), retrying transient failures.
+    Nothing is buffered in memory beyond one chunk.
+
+    Return: (file, None), or (file, exception) if the download failed
+    """
+    try:
+        _fetch(file, out_fp, creds)
+        return file, None
+
+    except requests.RequestException as error:
+        if os.path.exists(out_fp): os.remove(out_fp)  # Don't leave partial files
+        return file, error
+
+
 def download(drive_folder, output_dir=None, test_run=False):
     if not output_dir and not test_run:
         raise ValueError("output_dir must be specified if not test run") 
@@ -96,7 +211,9 @@ def download(drive_folder, output_dir=None, test_run=False):
     files = []
 
     try:
-        client = build('drive', 'v3', credentials=creds)
+        # Discovery doc ships with the client library, so no HTTP fetch to build this
+        client = build(
+            'drive', 'v3', credentials=creds, static_discovery=True, cache_discovery=False)
 
         # Get ID of target folder
         response = client.files().list(
@@ -118,8 +235,8 @@ def download(drive_folder, output_dir=None, test_run=False):
         while True:
             response = client.files().list(
                 q=f"'{folder_id}' in parents",
-                pageSize=10,
-                fields="nextPageToken, files(id,name)",
+                pageSize=1000,  # Drive API maximum; one request per 1000 files
+                fields="nextPageToken, files(id,name,size,md5Checksum)",
                 pageToken=page_token
             ).execute()
 
@@ -144,37 +261,46 @@ def download(drive_folder, output_dir=None, test_run=False):
             print(f"> {file['name']}")
         return
     
-    # Else, download files one by one (track duplicates)
-    fn_counts = {}
-    print(f"Downloading to {output_dir}...")
-    for file in tqdm(files):
-    # for file in files:
-        file_id = file['id']
-
-        try:
-            file_request = client.files().get_media(fileId=file_id)
-
-            bytes_file = io.BytesIO()
-            downloader = MediaIoBaseDownload(bytes_file, file_request)
-            done = False
-            while done is False:
-                status, done = downloader.next_chunk()
-            
-            # Save the BytesIO file to disk
-            out_fp = os.path.join(output_dir, file['name'])
-            if out_fp not in fn_counts: fn_counts[out_fp] = 1
-            else:
-                fn_counts[out_fp] += 1
-                out_fp = f"{'.'.join(out_fp.split('.')[:-1])}_{fn_counts[out_fp]}.{out_fp.split('.')[-1]}" 
-
-            with open(out_fp, 'wb') as f:
-                f.write(bytes_file.getbuffer())
-        
-        except HttpError as error:
-            print(f"HTTP error while downloading {file['name']}; skipping")
-
-    for fn, counts in fn_counts.items():
-        if counts > 1: print(f"Duplicate file: {fn} ({counts} instances)")
+    # Else, resolve output paths (tracking duplicates) up front, then download files not
+    # already present concurrently, each streamed straight to its path
+    fn_counts = defaultdict(int)
+    out_fps = []
+    for file in files:
+        out_fp = os.path.join(output_dir, file['name'])
+        fn_counts[out_fp] += 1
+        if fn_counts[out_fp] > 1:
+            if fn_counts[out_fp] == 2: print(f"Duplicate file: {out_fp} (suffixing copies)")
+            root, ext = os.path.splitext(out_fp)
+            out_fp = f"{root}_{fn_counts[out_fp]}{ext}"
+        out_fps.append(out_fp)
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Skip files already downloaded intact. Sizes of existing files come from one
+        # directory scan (rather than a stat per file), and are checked before hashing.
+        local_sizes = {
+            entry.name: entry.stat().st_size
+            for entry in os.scandir(output_dir) if entry.is_file()
+        }
+        downloaded = list(executor.map(
+            _is_downloaded, files, out_fps,
+            [local_sizes.get(os.path.basename(out_fp)) for out_fp in out_fps]))
+        to_download = [
+            (file, out_fp)
+            for file, out_fp, done in zip(files, out_fps, downloaded) if not done
+        ]
+        if len(to_download) < len(files):
+            print(f"> Skipping {len(files) - len(to_download)} files already downloaded.")
+
+        print(f"Downloading to {output_dir}...")
+        futures = [
+            executor.submit(_download_one, file, out_fp, creds)
+            for file, out_fp in to_download
+        ]
+
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            file, error = future.result()
+            if error is not None:
+                print(f"Error while downloading {file['name']} ({error}); skipping")
 
 
 if __name__ == "__main__":
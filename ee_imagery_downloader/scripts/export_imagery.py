@@ -38,6 +38,9 @@ def parse_args():
     parser.add_argument('--mosaic-window', default=None,
                         help='Mosaic imagery by interval specified (no mosaicking by default)')
 
+    parser.add_argument('--high-volume', action='store_true',
+                        help='Use the Earth Engine high-volume endpoint (for many exports)')
+
     args = parser.parse_args()
     roi = args.roi
     collection = args.collection
@@ -75,14 +78,15 @@ def parse_args():
         'season': season,
         'date_query': date_query,
         'res': res,
-        'mosaic_window': args.mosaic_window
+        'mosaic_window': args.mosaic_window,
+        'high_volume': args.high_volume
     }
 
 
 if __name__ == "__main__":
     args = parse_args()
 
-    interface = eeImageryInterface(args['roi'])
+    interface = eeImageryInterface(args['roi'], high_volume=args['high_volume'])
     interface.exportImagery(
         args['collection'],
         bands=args['bands'],
@@ -1,11 +1,16 @@
 import ee
+import numpy as np
 from tqdm import tqdm
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 """
 Collection of stateless functions performing miscellaneous tasks related to image
 filtering, processing and download.
 """
 
+# Export tasks started concurrently; EE recommends few (~5) concurrent requests per user
+MAX_EXPORT_WORKERS = 5
+
 def user_confirms(question, default=True):
     valid_responses = {"yes": True, "y": True, "ye": True, "no": False, "n": False}
     prompt = '[y/n]'
@@ -23,62 +28,24 @@ def user_confirms(question, default=True):
             print(f"valid responses are {', '.join(valid_responses.keys())}")
 
 
-def flatten_nested_imagery_filters(filter_dict, nested_keys=[], max_depth=10):
-    """
-    Recursively flatten nested image filtering config dictionary.
-    Depth First Search-inspired.
-
-    Args:
-        filter_dict (dict): Potentially nested dictionary describing imagery groups
-            and filters for a given year and collection.
-        max_depth (int): How deep into the nested dictionary to look for 'filters'
-            before giving up.
-    
-    Return: flattened version of filter_dict;
-        grouped_filters_list (list[dict{nested_keys, filters}]) 
-    """
-    # Base cases
-    if 'filters' in filter_dict:  # Filters found
-        return [{
-            'nested_keys': nested_keys,
-            'filters': filter_dict['filters']
-        }]
-    if max_depth < 1:  # recursion limit exceeded - return empty filter & append None
-        return [{
-            'nested_keys': nested_keys + [None],
-            'filters': []
-        }]
-
-    # Recursion case - return filters for all children
-    grouped_filters_list = []
-    for sub_key, sub_dict in filter_dict.items():
-        sub_grouped_filters_list = flatten_nested_imagery_filters(
-            sub_dict,
-            nested_keys=nested_keys + [sub_key],
-            max_depth=max_depth-1)
-
-        # Expect children to return a list of grouped filters
-        for sub_grouped_filters in sub_grouped_filters_list:
-            grouped_filters_list.append(sub_grouped_filters)
-    
-    return grouped_filters_list        
-
-
-def genImageBasename(collection, nested_keys=[], scale=None):
+def genImageBasename(collection, nested_keys=None, scale=None):
     """
     Synthesize an identifier for all images belonging to a particular group defined
     by collection & nested_keys. Optionally include scale information.
 
     A per-image datetime string and file extension should be appended to this.
     """
-    return (
-        f"{collection}"
-        f"{'_' + '_'.join(nested_keys) if nested_keys else ''}"
-        f"{'_' + str(scale) + 'm' if scale else ''}"
-    )
+    parts = [collection]
+    if nested_keys: parts.extend(nested_keys)
+    if scale: parts.append(f"{scale}m")
+    return '_'.join(parts)
 
 
 def get_date_range_overlap(range1_start, range1_end, range2_start, range2_end):
+    """
+    Overlap of a single pair of date ranges, or None; see get_date_range_overlaps for
+    many ranges at once.
+    """
     overlap_start = max(range1_start, range2_start)
     overlap_end = min(range1_end, range2_end)
 
@@ -90,6 +57,18 @@ def get_date_range_overlap(range1_start, range1_end, range2_start, range2_end):
     }
 
 
+def get_date_range_overlaps(range1_start, range1_end, range2_start, range2_end):
+    """
+    Vectorized get_date_range_overlap: arguments are np.datetime64 arrays (or scalars)
+    that broadcast against each other, e.g. all season ranges vs. one query range.
+
+    Return: (overlap_starts, overlap_ends, valid), where valid flags ranges that overlap
+    """
+    overlap_starts = np.maximum(range1_start, range2_start)
+    overlap_ends = np.minimum(range1_end, range2_end)
+    return overlap_starts, overlap_ends, overlap_starts <= overlap_ends
+
+
 
 # ------- EarthEngine functions ------- #
 
@@ -98,51 +77,9 @@ def latlnFromPolygon(ee_poly):
 
 
 def dateToDatestring(ee_date):
+    # Only wrap non-Dates (e.g. millis); format() already returns an ee.String
     if not isinstance(ee_date, ee.Date): ee_date = ee.Date(ee_date)
-    return ee.String(ee_date.format("YYYYMMdd'T'HHmm"))
-
-
-def genMosaickingFunction(image_collection, roi, mosaic_window='hour'):
-    """
-    Often iterator-type functions operating over a collection reference the collection
-    itself, which is bad news for generalizability. Here, we bind such a function to
-    whatever collection (and roi) is passed.
-
-    Args:
-        - image_collection: ee.ImageCollection to mosaic
-        - roi: ee.Geometry object
-        - mosaic_window (default='hour'): one of 'hour', 'day', 'week' or 'month'
-    """
-    supported_mosaic_windows = ['hour', 'day', 'week', 'month']
-    if mosaic_window not in supported_mosaic_windows:
-        raise ValueError(f"mosaic_window must be in {supported_mosaic_windows}; " \
-                         f"received {mosaic_window}")
-    
-    # First sort image_collection by system:time_start in ascending order. This
-    # guarantees that a windowing pass over a time range will capture all images well.
-    sorted_collection = image_collection.sort('system:time_start')
-
-    def mosaicCollection(datetime, image_list):
-        """
-        Mosaic all images in image_list within an hour of of the given datetime
-        """
-        datetime = ee.Date(datetime)
-        image_list = ee.List(image_list)
-        
-        tiles_in_window = sorted_collection.filterDate(
-            datetime, datetime.advance(1, mosaic_window))
-        mosaicked = ee.Image(tiles_in_window.mosaic()).set({
-            'system:time_start': tiles_in_window.first().get('system:time_start'),
-            'resolution_meters': tiles_in_window.first().get('resolution_meters')
-        })
-        mosaicked = mosaicked.clip(roi)
-        return ee.List(ee.Algorithms.If(
-            tiles_in_window.size(),
-            image_list.add(mosaicked),
-            image_list
-        ))
-    
-    return mosaicCollection
+    return ee_date.format("YYYYMMdd'T'HHmm")
 
 
 def doMosaic(collection, startDate, endDate, roi, mosaic_window='hour'):
@@ -161,23 +98,44 @@ def doMosaic(collection, startDate, endDate, roi, mosaic_window='hour'):
 
     In this scenario, img1 and img2 will be mosaicked, but img3 will not, even though it
     is within 1 hour of img2.
+
+    Mosaicking is memory-intensive server-side; filter collection (dates, bounds) and
+    select only the bands needed before calling this, so fewer & smaller images are
+    mosaicked.
     """
     supported_mosaic_windows = ['hour', 'day', 'week', 'month']
     if mosaic_window not in supported_mosaic_windows:
         raise ValueError(f"mosaic_window must be in {supported_mosaic_windows}; " \
                          f"received {mosaic_window}")
 
-    diff = endDate.difference(startDate, mosaic_window)
-    datetime_list = ee.List.sequence(0, diff).map(
-        lambda hour: startDate.advance(hour, mosaic_window)
-    )
-
     if not isinstance(collection, ee.ImageCollection):
         print(f"Mosaic called on {type(collection)}, {collection}")
 
-    mosaicking_func = genMosaickingFunction(collection, roi, mosaic_window=mosaic_window)
-    mosaics = ee.List(datetime_list.iterate(mosaicking_func, ee.List([])))
-    mosaics = ee.ImageCollection(mosaics)
+    # Tag each image with the index of the window it falls in, in one pass over the
+    # collection, rather than filtering the whole collection once per window. Sorting by
+    # system:time_start puts the latest tile on top & the earliest first in each window.
+    n_windows = endDate.difference(startDate, mosaic_window).floor()
+    tagged = collection.sort('system:time_start').map(
+        lambda img: img.set(
+            'mosaic_window', img.date().difference(startDate, mosaic_window).floor())
+    ).filter(ee.Filter.rangeContains('mosaic_window', 0, n_windows))
+
+    def mosaicWindow(window):
+        """
+        Mosaic all images tagged with the given window
+        """
+        tiles_in_window = tagged.filter(ee.Filter.eq('mosaic_window', window))
+        first_tile = tiles_in_window.first()
+        mosaicked = ee.Image(tiles_in_window.mosaic()).set({
+            'system:time_start': first_tile.get('system:time_start'),
+            'resolution_meters': first_tile.get('resolution_meters')
+        })
+        return mosaicked.clip(roi)
+
+    # Only windows that actually contain images are mapped over, so there are no empty
+    # mosaics to drop afterwards
+    windows = tagged.aggregate_array('mosaic_window').distinct()
+    mosaics = ee.ImageCollection.fromImages(windows.map(mosaicWindow))
 
     return mosaics
 
@@ -185,16 +143,28 @@ def doMosaic(collection, startDate, endDate, roi, mosaic_window='hour'):
 def exportImageCollection(collection, region, coll_basename, export_params):
     coll_list = collection.toList(collection.size())
     export_tasks = []
-    
-    coll_size = coll_list.size().getInfo()
+
+    # Fetch every image's datestring (and thereby the collection size) in a single
+    # round-trip, rather than one getInfo() per image
+    img_dtstrings = coll_list.map(
+        lambda img: dateToDatestring(ee.Image(img).date())).getInfo()
+    coll_size = len(img_dtstrings)
     print(f"Launching {coll_size} export tasks...")
 
     exported_imgname_counts = {}
 
-    for i in tqdm(range(coll_size)):
-        img = ee.Image(coll_list.get(i)).double()
-
-        img_dtstring = dateToDatestring(img.date()).getInfo()
+    scale = None
+    dims = None
+    crsTransform = None
+    if 'dimensions' in export_params: dims = export_params['dimensions']
+    elif 'scale' in export_params: scale = export_params['scale']
+    elif 'crsTransform' in export_params: crsTransform = export_params['crsTransform']
+
+    # Build all tasks first (no network requests), then start them concurrently
+    for i, img_dtstring in enumerate(img_dtstrings):
+        # Mask to the RoI polygon right before export; the export region alone only
+        # clips to its bounding box
+        img = ee.Image(coll_list.get(i)).double().clip(region)
         img_name = f"{coll_basename}_{img_dtstring}"
 
         if img_name not in exported_imgname_counts:
@@ -203,13 +173,6 @@ def exportImageCollection(collection, region, coll_basename, export_params):
             exported_imgname_counts[img_name] += 1
             img_name += f"_{exported_imgname_counts[img_name]}"
 
-        scale = None
-        dims = None
-        crsTransform = None
-        if 'dimensions' in export_params: dims = export_params['dimensions']
-        elif 'scale' in export_params: scale = export_params['scale']
-        elif 'crsTransform' in export_params: crsTransform = export_params['crsTransform']
-
         task = ee.batch.Export.image.toDrive(
             image=img,
             folder=export_params['folder'],
@@ -221,9 +184,16 @@ def exportImageCollection(collection, region, coll_basename, export_params):
             scale=scale,
             maxPixels=1e13
         )
-        task.start()
-
         export_tasks.append(task)
 
+    # Each start() is a blocking request to the EE batch service; submit several at once.
+    # This is safe from threads: ee.data's cloud API client opens a fresh requests
+    # session for every request, so no connection is shared between them.
+    # Progress advances as each start() completes; any start() error is re-raised.
+    with ThreadPoolExecutor(max_workers=MAX_EXPORT_WORKERS) as executor:
+        futures = [executor.submit(task.start) for task in export_tasks]
+        for future in tqdm(as_completed(futures), total=len(futures)):
+            future.result()
+
     return export_tasks
 